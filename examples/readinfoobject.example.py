@@ -4,7 +4,8 @@ API Key.
 import atomapi
 from atomapi.authorizer import F5Authorizer
 
-# Use the F5 authorizer. You will need to log in the first time data is fetched
+# Use the F5 authorizer. You will need to log in the first time data is fetched. Pass
+# cookie_file='f5_cookies.json' to stay logged in between runs of this script
 atom = atomapi.Atom('https://youratom.ca', api_key='1234567890')
 f5 = F5Authorizer(atom.url, cache_credentials=True)
 atom.set_authorizer(f5)
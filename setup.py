@@ -18,7 +18,12 @@ setup(
     scripts=[],
     install_requires=[
         "requests>=2.0.0",
-        "bs4==0.0.1",
+        "urllib3>=1.26",
+        "lxml",
     ],
-    python_requires='>=3.6',
+    extras_require={
+        "brotli": ["brotli"],
+        "orjson": ["orjson"],
+    },
+    python_requires='>=3.8',
 )
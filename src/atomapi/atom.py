@@ -1,80 +1,110 @@
+from functools import cached_property
 from urllib.parse import urljoin
 from urllib.robotparser import RobotFileParser
 
 import requests
+from requests.adapters import DEFAULT_POOLSIZE, DEFAULT_RETRIES, HTTPAdapter
+from urllib3.util.retry import Retry
 
+from atomapi.cache import Cache
 from atomapi.languages import ISO_639_1_LANGUAGES
 from atomapi.utils import parse_url_from_string
 from atomapi.models.taxonomy import Taxonomy, VirtualTaxonomy
 from atomapi.models.authority import VirtualAuthority
+from atomapi.models.base import VirtualBaseModel
 from atomapi.models.informationobject import InformationObject
 from atomapi.authorizer import Authorizer, BasicAuthorizer
 
 
+# Checked on every request, so a set is used rather than scanning the list of languages
+_ISO_639_1_LANGUAGE_SET = frozenset(ISO_639_1_LANGUAGES)
+
+
 class Atom:
     ''' The top-level class that manages access to an AtoM instance '''
 
     USER_AGENT = 'Python requests v2'
 
-    def __init__(self, url: str, api_key: str = None, authorizer=None):
+    def __init__(self, url: str, api_key: str = None, authorizer=None, cache_seconds: int = 0):
         parsed_url = parse_url_from_string(url.rstrip("/"))
         self.host = parsed_url.host
         self.url = str(parsed_url)
+        self._url_prefix = self.url.rstrip('/') + '/'
         self.api_key = api_key or ''
         self._ignore_robots = False
         self.robots = RobotFileParser(urljoin(self.url, 'robots.txt'))
         self._authorizer = authorizer
-
-        # Lazily-evaluated objects
-        self._session = None
-        self._taxonomies = None
-        self._informationobjects = None
-        self._virtual_taxonomies = None
-        self._virtual_authorities = None
+        self.cache = Cache(cache_seconds)
 
     def set_authorizer(self, authorizer: Authorizer):
         self._authorizer = authorizer
+        # Anything cached may have been fetched, or refused, with the old credentials
+        self.cache.clear()
 
     def set_api_key(self, key: str):
         self.api_key = key
+        self.cache.clear()
 
-    @property
+    @cached_property
     def taxonomies(self) -> Taxonomy:
         ''' Access taxonomies with the browse() method. '''
-        if self._taxonomies is None:
-            self._taxonomies = Taxonomy(self)
-        return self._taxonomies
+        return Taxonomy(self)
 
-    @property
+    @cached_property
     def informationobjects(self) -> InformationObject:
         ''' Read information objects with the read() method, or search for objects with the
         browse() method.
         '''
-        if self._informationobjects is None:
-            self._informationobjects = InformationObject(self)
-        return self._informationobjects
+        return InformationObject(self)
 
-    @property
+    @cached_property
     def v_taxonomies(self) -> VirtualTaxonomy:
         ''' Scrape taxonomies from the frontend with the browse() method. '''
-        if self._virtual_taxonomies is None:
-            self._virtual_taxonomies = VirtualTaxonomy(self)
-        return self._virtual_taxonomies
+        return VirtualTaxonomy(self)
 
-    @property
+    @cached_property
     def v_authorities(self) -> VirtualAuthority:
         ''' Scrape authorities from the frontend with the browse() method. '''
-        if self._virtual_authorities is None:
-            self._virtual_authorities = VirtualAuthority(self)
-        return self._virtual_authorities
+        return VirtualAuthority(self)
 
-    @property
+    @cached_property
     def session(self) -> requests.Session:
-        if self._session is None:
-            if self._authorizer is None:
-                self._authorizer = BasicAuthorizer(self.url)
-            self._session = self._authorizer.authorize()
-        return self._session
+        ''' The authorized session shared by every request made to the AtoM instance. The session
+        is created once so that its connection pool can keep connections to the host alive.
+        '''
+        if self._authorizer is None:
+            self._authorizer = BasicAuthorizer(self.url)
+        session = self._authorizer.authorize()
+        self._mount_adapters(session)
+        return session
+
+    def _mount_adapters(self, session: requests.Session):
+        ''' Size the session's connection pool to match the number of threads that scrape the
+        front end concurrently, so every thread can keep its own connection alive. Failed requests
+        due to a temporarily unavailable server are retried a few times.
+
+        The adapter is only mounted where the session still has requests' default adapter. If the
+        authorizer mounted its own adapter, for client certificates or its own retries for example,
+        that adapter is left in place.
+        '''
+        adapter = HTTPAdapter(
+            pool_maxsize=VirtualBaseModel.MAX_THREAD_POOL_EXECUTORS,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                              raise_on_status=False),
+        )
+        for prefix in ('https://', 'http://'):
+            if self._is_default_adapter(session.adapters.get(prefix)):
+                session.mount(prefix, adapter)
+
+    @staticmethod
+    def _is_default_adapter(adapter) -> bool:
+        ''' Check whether an adapter is the one a new requests Session mounts by default '''
+        # pylint: disable=protected-access
+        return (
+            type(adapter) is HTTPAdapter
+            and adapter._pool_maxsize == DEFAULT_POOLSIZE
+            and adapter.max_retries.total == DEFAULT_RETRIES
+        )
 
     def get(self, path: str, params: dict = None, headers: dict = None,
             sf_culture: str = 'en') -> tuple:
@@ -90,22 +120,23 @@ class Atom:
         Returns:
             (tuple): A two-tuple containing the raw Response object and the URL requested
         '''
-        if sf_culture not in ISO_639_1_LANGUAGES:
+        if sf_culture not in _ISO_639_1_LANGUAGE_SET:
             raise ValueError(f'the language code "{sf_culture}" is not in the ISO 639-1 standard')
 
-        request_url = urljoin(self.url, path)
+        relative_path = path.lstrip('/')
+        request_url = self._url_prefix + relative_path
         request_headers = headers or {}
         request_params = params or {}
         if sf_culture:
             request_params['sf_culture'] = sf_culture
 
-        if path.lstrip('/').startswith('api/'):
+        if relative_path.startswith('api/'):
             if not self.api_key:
                 raise ConnectionError('cannot access AtoM API without an API key set')
             request_headers['REST-API-Key'] = self.api_key
         elif not self._ignore_robots:
             if self.robots.last_checked == 0:
-                self.robots.read()
+                self._read_robots()
             if not self.robots.can_fetch(self.USER_AGENT, request_url):
                 raise ConnectionError(f'The robots.txt file for {self.url} does not permit '
                                       'web scraping by this application.')
@@ -114,8 +145,30 @@ class Atom:
         response.raise_for_status()
         return response, request_url
 
+    def _read_robots(self):
+        ''' Fetch and parse the robots.txt file with the shared session, so that the check re-uses
+        the same connection as every other request rather than opening its own.
+
+        The responses are treated the same way as RobotFileParser.read() treats them: if access to
+        robots.txt is denied, nothing may be fetched, and if there is no robots.txt, everything may
+        be fetched. If the server fails to serve robots.txt, it is left unread, so nothing may be
+        fetched, and it is requested again before the next request.
+        '''
+        response = self.session.get(self.robots.url)
+        if response.status_code >= 500:
+            return
+        if response.status_code in (401, 403):
+            self.robots.disallow_all = True
+            self.robots.modified()
+        elif 400 <= response.status_code < 500:
+            self.robots.allow_all = True
+            self.robots.modified()
+        else:
+            self.robots.parse(response.text.splitlines())
+
     def reset_connection(self):
         ''' Reset the connection to the AtoM instance. The authorizer will be asked for a new
-        session when the the next request is made.
+        session when the the next request is made, and the cache is cleared.
         '''
-        self._session = None
+        self.__dict__.pop('session', None)
+        self.cache.clear()
@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
 from functools import lru_cache
-from urllib.parse import urljoin
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
 import getpass
+import json
+import os
+import time
 
 from requests import Session
+from requests.cookies import create_cookie
 
 
 class Authorizer(ABC):
@@ -38,15 +43,36 @@ def prompt_for_username_password(prompt: str):
 
 
 class F5Authorizer(Authorizer):
+    ''' Log in to an F5 Access Policy Manager before accessing AtoM.
+
+    If a cookie_file is passed, the F5 session cookies are saved to that file after logging in, and
+    are re-used the next time a session is authorized - even in a different process - until they
+    are no longer accepted by F5. The domain, path, and secure flag of each cookie are saved with
+    it, so the cookies are only sent where F5 meant them to be sent, and only cookies for the host
+    of the url are re-used.
+    '''
     def __init__(self, url: str, **kwargs):
         super().__init__(url, **kwargs)
         cache_creds = kwargs.get('cache_credentials') or False
         self.cache_credentials = bool(cache_creds)
+        cookie_file = kwargs.get('cookie_file')
+        self.cookie_file = Path(cookie_file) if cookie_file else None
 
     def authorize(self) -> Session:
-        ''' Log in to F5 before returning the session '''
+        ''' Log in to F5 before returning the session. If there are saved cookies that still
+        grant access, they are used instead of logging in again.
+        '''
         session = Session()
+        if self._load_cookies(session):
+            if self._is_authorized(session):
+                return session
+            session.cookies.clear()
 
+        self._log_in(session)
+        self._save_cookies(session)
+        return session
+
+    def _log_in(self, session: Session):
         # Get initial session cookies
         _ = session.post(self.url)
 
@@ -67,4 +93,63 @@ class F5Authorizer(Authorizer):
         if 'Access was denied by the access policy' in response.text:
             raise ConnectionError('Access to the server was denied. Make sure you have access to '
                                   'this AtoM instance.')
-        return session
+
+    def _is_authorized(self, session: Session) -> bool:
+        ''' Make a cheap request to check whether F5 still accepts the session's cookies. F5
+        redirects to its login policy if it does not.
+        '''
+        response = session.head(self.url, allow_redirects=False)
+        if response.status_code in (401, 403):
+            return False
+        return 'my.policy' not in response.headers.get('Location', '')
+
+    def _load_cookies(self, session: Session) -> bool:
+        ''' Load the saved cookies that belong to the host of the url into the session.
+
+        Returns:
+            (bool): True if any cookies were loaded
+        '''
+        if self.cookie_file is None or not self.cookie_file.is_file():
+            return False
+        try:
+            saved_cookies = json.loads(self.cookie_file.read_text(encoding='utf-8'))
+            cookies = [create_cookie(**saved) for saved in saved_cookies]
+        except (OSError, ValueError, TypeError):
+            return False
+        now = time.time()
+        loaded = False
+        for cookie in cookies:
+            if cookie.expires is not None and cookie.expires <= now:
+                continue
+            if not self._is_cookie_for_host(cookie.domain):
+                continue
+            session.cookies.set_cookie(cookie)
+            loaded = True
+        return loaded
+
+    def _is_cookie_for_host(self, domain: str) -> bool:
+        host = (urlparse(self.url).hostname or '').lower()
+        domain = domain.lower().lstrip('.')
+        return bool(domain) and (host == domain or host.endswith('.' + domain))
+
+    def _save_cookies(self, session: Session):
+        if self.cookie_file is None:
+            return
+        # The cookies grant access to AtoM, so the file is created private to the user, rather than
+        # being made private after the cookies have already been written to it
+        file_descriptor = os.open(self.cookie_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8') as cookie_file:
+            if hasattr(os, 'fchmod'):
+                # The mode is only applied to new files, so make an existing file private too
+                os.fchmod(file_descriptor, 0o600)
+            cookie_file.write(json.dumps([
+                {
+                    'name': cookie.name,
+                    'value': cookie.value,
+                    'domain': cookie.domain,
+                    'path': cookie.path,
+                    'secure': cookie.secure,
+                    'expires': cookie.expires,
+                }
+                for cookie in session.cookies
+            ]))
@@ -0,0 +1,128 @@
+''' In-memory cache for responses from AtoM '''
+from collections import OrderedDict
+from threading import Lock
+import time
+
+
+class Cache:
+    ''' Keeps objects in memory for a set number of seconds. A cache with a lifetime of zero seconds
+    is disabled, and does not store anything. Once the cache holds maxsize objects, the least
+    recently used object is removed to make room for a new one.
+
+    Objects are stored and retrieved as-is, so an object retrieved from the cache should not be
+    modified.
+
+    Errors can also be stored, so that a request that fails is not sent to the server again right
+    away. Errors are kept for error_seconds, or for the lifetime of the cache if it is shorter.
+    '''
+    def __init__(self, seconds: int = 0, maxsize: int = 128, error_seconds: int = 60):
+        self.seconds = seconds
+        self.maxsize = maxsize
+        self.error_seconds = min(seconds, error_seconds)
+        self.enabled = seconds > 0
+        self._entries = OrderedDict()
+        self._errors = OrderedDict()
+        self._lock = Lock()
+
+    def retrieve(self, key):
+        ''' Get an object from the cache.
+
+        Args:
+            key: The hashable key the object was stored under
+
+        Returns:
+            The cached object, or None if the object is not in the cache or has expired
+        '''
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, obj, etag, last_modified = entry
+            if expires <= time.monotonic():
+                # Expired objects are kept if the server can tell us whether they have changed
+                if not etag and not last_modified:
+                    del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return obj
+
+    def retrieve_stale(self, key) -> tuple:
+        ''' Get an expired object along with the headers needed to ask the server whether it has
+        changed since it was stored. If the server responds with 304 Not Modified, the object can
+        be stored again rather than downloaded again.
+
+        Args:
+            key: The hashable key the object was stored under
+
+        Returns:
+            (tuple): A two-tuple containing the expired object and a dict of conditional request
+            headers. The object is None and the dict is empty if there is nothing to revalidate
+        '''
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None, {}
+        _, obj, etag, last_modified = entry
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return obj, headers
+
+    def store(self, key, obj, etag: str = None, last_modified: str = None):
+        ''' Store an object in the cache. Nothing is stored if the cache is disabled.
+
+        Args:
+            key: A hashable key to store the object under
+            obj: The object to store
+            etag (str): The ETag header the server sent with the object, if any
+            last_modified (str): The Last-Modified header the server sent with the object, if any
+        '''
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.seconds, obj, etag, last_modified)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def retrieve_error(self, key):
+        ''' Get an error from the cache.
+
+        Args:
+            key: The hashable key the error was stored under
+
+        Returns:
+            The cached exception, or None if no error is in the cache or it has expired
+        '''
+        with self._lock:
+            entry = self._errors.get(key)
+            if entry is None:
+                return None
+            expires, error = entry
+            if expires <= time.monotonic():
+                del self._errors[key]
+                return None
+            return error
+
+    def store_error(self, key, error: Exception):
+        ''' Store an error in the cache. Nothing is stored if the cache is disabled.
+
+        Args:
+            key: A hashable key to store the error under
+            error (Exception): The exception raised for the failed request
+        '''
+        if not self.enabled:
+            return
+        with self._lock:
+            self._errors[key] = (time.monotonic() + self.error_seconds, error)
+            self._errors.move_to_end(key)
+            while len(self._errors) > self.maxsize:
+                self._errors.popitem(last=False)
+
+    def clear(self):
+        ''' Remove every object and error from the cache '''
+        with self._lock:
+            self._entries.clear()
+            self._errors.clear()
@@ -1,4 +1,8 @@
-from atomapi.models.base import VirtualBaseModel
+from typing import Iterator
+
+from lxml import etree
+
+from atomapi.models.base import VirtualBaseModel, element_text, xpath_has_class
 
 class VirtualAuthority(VirtualBaseModel):
     ''' Browse a list of all of the authorities in AtoM. AtoM does not have an API to fetch
@@ -16,6 +20,12 @@ class VirtualAuthority(VirtualBaseModel):
     +--------------+-------------------------------------------------+
     '''
 
+    AUTHORITY_XPATH = etree.XPath(f'//article[{xpath_has_class("search-result")}]')
+    TITLE_ANCHOR_XPATH = etree.XPath(f'.//p[{xpath_has_class("title")}]/descendant::a[1]')
+    # string() gives an empty string when there is no reference code, rather than an empty list
+    REFERENCE_CODE_XPATH = etree.XPath(f'string(.//li[{xpath_has_class("reference-code")}])',
+                                       smart_strings=False)
+
     @property
     def raw_page_path(self):
         return '/actor/browse?page={page}&limit={limit}'
@@ -29,22 +39,30 @@ class VirtualAuthority(VirtualBaseModel):
         Returns:
             (list): A list of authorities. Each authority is a dict with a name, and a
             reference_code. The reference_code may be empty if the authority doesn't have one.
+            If the Atom has a cache, the list is shared with later calls, so copy it before
+            modifying it
         '''
-        return self.get_list_from_ui(self.raw_page_path, sieve_soup=self._extract_authorities,
+        return self.get_list_from_ui(self.raw_page_path, sieve_page=self._extract_authorities,
                                      sf_culture=sf_culture)
 
-    def _extract_authorities(self, html_soup):
-        for element in html_soup.find_all('article', class_='search-result'):
-            authority_name = ''
-            reference_code = ''
+    def iter_browse(self, sf_culture: str = 'en') -> Iterator:
+        ''' Iterate over all authorities from the AtoM frontend as the pages of the list are
+        fetched, without holding the whole list in memory. Results are not cached.
 
-            title_anchor_tag = element.find('p', class_='title').find('a')
-            if not title_anchor_tag:
-                continue
-            authority_name = title_anchor_tag.string
+        Args:
+            sf_culture (str): The language to fetch results in, defaults to 'en'
 
-            ref_code_li_tag = element.find('li', class_='reference-code')
-            if ref_code_li_tag:
-                reference_code = ref_code_li_tag.string
+        Returns:
+            (Iterator): An iterator over authorities, which are the same dicts browse() returns
+        '''
+        return self.iter_list_from_ui(self.raw_page_path, sieve_page=self._extract_authorities,
+                                      sf_culture=sf_culture)
 
-            yield {'name': authority_name, 'reference_code': reference_code}
+    def _extract_authorities(self, page):
+        for element in self.AUTHORITY_XPATH(page):
+            if not (title_anchor_tags := self.TITLE_ANCHOR_XPATH(element)):
+                continue
+            yield {
+                'name': element_text(title_anchor_tags[0]),
+                'reference_code': self.REFERENCE_CODE_XPATH(element),
+            }
@@ -1,37 +1,145 @@
 from abc import ABC
-from typing import Callable
+from typing import Callable, Iterator
+import collections
 import concurrent.futures
+import copy
+import itertools
 import re
 
-from bs4 import BeautifulSoup
+from lxml import etree, html
+import requests
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+from atomapi.utils import partial_format
+
+
+def xpath_has_class(class_name: str) -> str:
+    ''' Create an XPath predicate that matches elements that have the class, whether or not they
+    have other classes as well.
+    '''
+    return f'contains(concat(" ", normalize-space(@class), " "), " {class_name} ")'
+
+
+# All of the text inside an element, including the text of its children. Plain strings are returned
+# so that the text does not keep the parsed page alive
+element_text = etree.XPath('string()', smart_strings=False)
 
 
 class BaseModel(ABC):
     ''' The base class for all API models '''
+
+    # Phrases that may be found in an error message from AtoM, with the error to raise for each
+    JSON_ERRORS = (
+        ('endpoint not found', 'Endpoint at "{url}" does not exist'),
+        ('not authorized', 'You are not authorized to access "{url}" with the API Key "{api_key}"'),
+    )
+
     def __init__(self, atom):
         self._atom = atom
 
     def get_json(self, path: str, params: dict = None, sf_culture: str = 'en'):
         if not path.lstrip('/').startswith('api/'):
             raise ValueError(f'the requested API path "{path}" is not an api path!')
-        response, url = self._atom.get(path, headers={}, params=params, sf_culture=sf_culture)
-        json_response = response.json()
+        cache = self._atom.cache
+        if not cache.enabled:
+            return self._parse_json(*self._atom.get(path, params=params, sf_culture=sf_culture))
+
+        # The key is made before the request, since the request adds sf_culture to the params
+        cache_key = (path, self._hashable_params(params), sf_culture)
+        json_response = cache.retrieve(cache_key)
+        if json_response is not None:
+            return json_response
+        error = cache.retrieve_error(cache_key)
+        if error is not None:
+            # Raise a copy, so the cached error does not collect a traceback each time it is raised,
+            # or get changed by several threads raising it at once
+            raise copy.copy(error)
+
+        stale_response, headers = cache.retrieve_stale(cache_key)
+        try:
+            response, url = self._atom.get(path, headers=headers, params=params,
+                                           sf_culture=sf_culture)
+        except requests.HTTPError as exc:
+            cache.store_error(cache_key, self._without_content(exc))
+            raise
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code == 304 and stale_response is not None:
+            cache.store(cache_key, stale_response, etag=etag or headers.get('If-None-Match'),
+                        last_modified=last_modified or headers.get('If-Modified-Since'))
+            return stale_response
+
+        try:
+            json_response = self._parse_json(response, url)
+        except ConnectionError as exc:
+            cache.store_error(cache_key, exc)
+            raise
+        cache.store(cache_key, json_response, etag=etag, last_modified=last_modified)
+        return json_response
+
+    @staticmethod
+    def _without_content(error: requests.HTTPError) -> requests.HTTPError:
+        ''' Make a copy of an HTTP error to cache, with a response that keeps the status, reason,
+        URL and headers, but not the body, so that cached errors stay small.
+        '''
+        if error.response is None:
+            return error
+        response = requests.Response()
+        response.status_code = error.response.status_code
+        response.reason = error.response.reason
+        response.url = error.response.url
+        response.headers = error.response.headers
+        response.request = error.response.request
+        response._content = b''
+        return requests.HTTPError(*error.args, request=error.request, response=response)
+
+    @staticmethod
+    def _hashable_params(params: dict) -> tuple:
+        ''' Make a hashable version of a dict of GET parameters. Parameters with several values are
+        given as lists, which are turned into tuples.
+        '''
+        if not params:
+            return ()
+        return tuple(sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in params.items()
+        ))
+
+    def _parse_json(self, response, url: str):
+        json_response = _json_loads(response.content)
         self.raise_for_json_error(json_response, url)
         return json_response
 
+    def get_json_many(self, paths: list, sf_culture: str = 'en') -> list:
+        ''' Get the JSON from several API paths at once. The requests are made concurrently, and
+        share the connections kept alive by the session's connection pool.
+
+        Args:
+            paths (list): The API paths to request
+            sf_culture (str): The language to get the content in
+
+        Returns:
+            (list): The JSON response for each path, in the same order as the paths
+        '''
+        # Make sure the session exists before the threads start, so it is only authorized once
+        _ = self._atom.session
+        return list(_EXECUTOR.map(lambda p: self.get_json(p, sf_culture=sf_culture), paths))
+
     def raise_for_json_error(self, json_response, request_url):
         ''' Check json response for error '''
-        if 'message' in json_response:
-            message = json_response['message']
-            message_lower = message.lower()
-            if 'endpoint not found' in message_lower:
-                raise ConnectionError(f'Endpoint at "{request_url}" does not exist')
-            if 'not authorized' in message_lower:
-                raise ConnectionError(
-                    f'You are not authorized to access "{request_url}" '
-                    f'with the API Key "{self._atom.api_key}"'
-                )
-            raise ConnectionError(f'Error connecting to "{request_url}": {message}')
+        # Successful responses may be long lists, which should not be scanned for a message
+        if not isinstance(json_response, dict) or 'message' not in json_response:
+            return
+        message = json_response['message']
+        message_lower = message.lower()
+        for phrase, error in self.JSON_ERRORS:
+            if phrase in message_lower:
+                raise ConnectionError(error.format(url=request_url, api_key=self._atom.api_key))
+        raise ConnectionError(f'Error connecting to "{request_url}": {message}')
 
 
 class VirtualBaseModel(ABC):
@@ -48,21 +156,26 @@ class VirtualBaseModel(ABC):
     '''
 
     RESULT_LIMIT = 10
-    MAX_THREAD_POOL_EXECUTORS = 5
+    MAX_THREAD_POOL_EXECUTORS = 16
     ACCEPTED_LANGUAGES = ('en', 'fr', 'es', 'nl', 'pt')
-    RESULTS = re.compile(
+    REQUIRED_PATH_PARAMS = ('{page}', '{limit}')
+    # AtoM always serves its pages as UTF-8, so the encoding never needs to be detected, and the
+    # result count can be searched for in the raw bytes of a page
+    PAGE_ENCODING = 'utf-8'
+    RESULTS = re.compile((
         r'(?:Results|Résultats|Resultados|Resultaten)\s+'
         r'(?P<start>\d+)'
         r'\s+(?:to|à|a|tot)\s+'
         r'(?P<end>\d+)'
         r'\s+(?:of|sur|de|van)\s+'
         r'(?P<total>\d+)'
-    )
+    ).encode(PAGE_ENCODING))
+    RESULT_COUNT_XPATH = etree.XPath(f'//div[{xpath_has_class("result-count")}]')
 
     def __init__(self, atom):
         self._atom = atom
 
-    def get_list_from_ui(self, raw_path: str, sieve_soup: Callable[[BeautifulSoup], list],
+    def get_list_from_ui(self, raw_path: str, sieve_page: Callable[[html.HtmlElement], list],
         sf_culture: str = 'en') -> list:
         ''' Parse all data item from an AtoM list. This may involve making multiple GET requests
         depending on how many items are in the list.
@@ -70,84 +183,159 @@ class VirtualBaseModel(ABC):
         Args:
             raw_path (str): The generic path used to access the front end. This path string should
             have an unformatted {page} and {limit} parameter.
-            sieve_soup (Callable[[BeautifulSoup], list]): A function that extracts the list of items
-            from the soup-ified pages.
+            sieve_page (Callable[[html.HtmlElement], list]): A function that extracts the list of
+            items from the root element of each parsed page.
             sf_culture (str): The language to get the content in
 
         Returns:
             (list): A list of parsed objects from the page. The type of objects depends on what the
-            parse_soup() function returns.
+            sieve_page() function returns. If the list is cached, the cached list is returned
+        '''
+        cache = self._atom.cache
+        cache_key = ('list', raw_path, sf_culture)
+        items = cache.retrieve(cache_key)
+        if items is None:
+            items = list(self.iter_list_from_ui(raw_path, sieve_page, sf_culture))
+            cache.store(cache_key, items)
+        return items
+
+    def iter_list_from_ui(self, raw_path: str, sieve_page: Callable[[html.HtmlElement], list],
+        sf_culture: str = 'en') -> Iterator:
+        ''' Parse the data items from an AtoM list as the pages of the list are fetched. Unlike
+        get_list_from_ui(), the items are not collected into a list, so the whole AtoM list never
+        has to be held in memory, and the first items are available as soon as their page arrives.
+        Only MAX_THREAD_POOL_EXECUTORS pages are fetched ahead of the page being read. Lists are
+        always fetched fresh, and are not cached.
+
+        Takes the same arguments as get_list_from_ui().
+
+        Returns:
+            (Iterator): An iterator over the parsed objects from the pages
         '''
         if sf_culture not in self.ACCEPTED_LANGUAGES:
             msg = (f'the language "{sf_culture}" is not supported for front-end scraping. '
-                   f'Only these languages are supported: {", ".join(self.ACCEPTED_LANGUAGES)}')
+                   'Only these languages are supported: '
+                   f'{", ".join(self.ACCEPTED_LANGUAGES)}')
+            raise ValueError(msg)
+        missing_params = [p for p in self.REQUIRED_PATH_PARAMS if p not in raw_path]
+        if missing_params:
+            msg = (f'the requested path does not have a {" or ".join(missing_params)} parameter - '
+                   'this is mandatory')
             raise ValueError(msg)
-        for param in (r'{page}', r'{limit}'):
-            if param not in raw_path:
-                msg = 'the requested path does not have a '+param+' parameter - this is mandatory'
-                raise ValueError(msg)
-
-        urls = self._enumerate_list_urls(raw_path, sf_culture)
-        all_items = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.MAX_THREAD_POOL_EXECUTORS) as \
-            executor:
-            # Get the text from the webpage for each URL asynchronously
-            web_requests = [executor.submit(self._get_page_soup, u, sf_culture) for u in urls]
-            # Process the soup as it comes in
-            for future in concurrent.futures.as_completed(web_requests):
-                html_soup = future.result()
-                for element in sieve_soup(html_soup):
-                    all_items.append(element)
-        return all_items
-
-    def _enumerate_list_urls(self, raw_path: str, sf_culture: str) -> list:
-        ''' Get the URL for every unique page in an AtoM list.
+
+        # The limit is the same on every page, so only the page number needs formatting per page
+        page_path = partial_format(raw_path, limit=self.RESULT_LIMIT)
+        # The first page is needed to find out how many pages there are, and is then parsed for its
+        # items like the rest of the pages, rather than being fetched a second time
+        first_page_content = self._get_page_content(page_path.replace('{page}', '1'), sf_culture)
+        total_items = self._get_total_list_items(first_page_content)
+        urls = self._enumerate_list_urls(page_path, total_items)
+        return self._iter_pages(first_page_content, urls, sieve_page, sf_culture)
+
+    def _iter_pages(self, first_page_content: bytes, urls: list,
+        sieve_page: Callable[[html.HtmlElement], list], sf_culture: str) -> Iterator:
+        # Only fetch the pages in the worker threads, so they spend their time waiting on the
+        # network rather than competing with each other to parse HTML. Only a limited number of
+        # pages are fetched ahead of the caller, so that the raw pages do not pile up in memory
+        # when the caller consumes the items slowly
+        remaining_urls = iter(urls)
+        web_requests = collections.deque(
+            _EXECUTOR.submit(self._get_page_content, u, sf_culture)
+            for u in itertools.islice(remaining_urls, self.MAX_THREAD_POOL_EXECUTORS)
+        )
+        try:
+            # The next pages download while the first page is parsed
+            yield from sieve_page(self._parse_page(first_page_content))
+            # Parse the pages in order. The later pages keep downloading while the earlier ones are
+            # parsed, so waiting on each page in turn costs little, and the items keep AtoM's order
+            while web_requests:
+                future = web_requests.popleft()
+                next_url = next(remaining_urls, None)
+                if next_url is not None:
+                    web_requests.append(
+                        _EXECUTOR.submit(self._get_page_content, next_url, sf_culture))
+                yield from sieve_page(self._parse_page(future.result()))
+        finally:
+            # Stop fetching pages if the caller stops iterating before the end of the list
+            for future in web_requests:
+                future.cancel()
+
+    def _enumerate_list_urls(self, page_path: str, total_items: int) -> list:
+        ''' Get the URL for every unique page in an AtoM list after the first page.
+
+        Args:
+            page_path (str): The path to the AtoM list, with an unformatted {page} parameter
+            total_items (int): The total number of items AtoM reported are in the list
 
         Returns:
-            (list): A list of all the URLs required to access every item in the AtoM list
+            (list): A list of the URLs required to access the rest of the items in the AtoM list
         '''
-        first_page_url = raw_path.format(page=1, limit=self.RESULT_LIMIT)
-        total_items = self._get_total_list_items(first_page_url, sf_culture)
-        all_urls = [first_page_url]
-        # Start at page 2, go up by 10 items each time until total_items is reached
-        for page_num, _ in enumerate(range(self.RESULT_LIMIT, total_items, self.RESULT_LIMIT), 2):
-            new_url = raw_path.format(page=page_num, limit=self.RESULT_LIMIT)
-            all_urls.append(new_url)
-        return all_urls
-
-    def _get_total_list_items(self, path: str, sf_culture: str) -> int:
-        ''' Get the total number of items in a list from AtoM. Searches for a div element with the
-        class 'result_count', and parses the total from the text in the div. The text in the result
-        element should look like:
+        # Ceiling division, without going through a float
+        total_pages = -(-total_items // self.RESULT_LIMIT)
+        # The page number is the only placeholder left, so it is substituted directly rather than
+        # parsing the format string for every page
+        return [page_path.replace('{page}', str(p)) for p in range(2, total_pages + 1)]
+
+    def _get_total_list_items(self, page_content: bytes) -> int:
+        ''' Get the total number of items in a list from AtoM. The total is parsed from the text in
+        the div element with the class 'result_count'. The text in the result element should look
+        like:
 
             Result 1 to 10 of 130
 
-        The number 130 is returned as the total.
+        The number 130 is returned as the total. The text is searched for in the raw HTML first,
+        and the page is only parsed to find the div if the text could not be found directly.
 
         Args:
-            path (str): A path to an AtoM list page
-            sf_culture (str): The language to get the content in
+            page_content (bytes): The content of the first page of an AtoM list
 
         Returns:
             (int): The total number of items AtoM reported are in the list
         '''
-        html_soup = self._get_page_soup(path, sf_culture)
-        result_tag = html_soup.find('div', class_='result-count')
-        results_match = self.RESULTS.search(str(result_tag))
+        result_count_index = page_content.find(b'result-count')
+        if result_count_index == -1:
+            raise ConnectionError('Could not find the result count on the first page of the list')
+        # Only the page from the tag holding the result count onwards is needed, so the text before
+        # it is skipped, and can't be mistaken for the result count
+        tag_index = max(page_content.rfind(b'<', 0, result_count_index), 0)
+        page_tail = page_content[tag_index:]
+        results_match = self.RESULTS.search(page_tail)
         if not results_match:
-            raise ConnectionError(f'Could not find total results in tag: {result_tag}')
+            result_tags = self.RESULT_COUNT_XPATH(self._parse_page(page_tail))
+            # Match the text alone, so that markup inside the phrase does not break the match. The
+            # whitespace is collapsed, so the match can be anchored at the start of the text
+            result_text = ''
+            if result_tags:
+                result_text = ' '.join(' '.join(result_tags[0].itertext()).split())
+            results_match = self.RESULTS.match(result_text.encode(self.PAGE_ENCODING))
+            if not results_match:
+                raise ConnectionError(f'Could not find total results in tag: {result_text!r}')
         total_items = int(results_match.group('total'))
         return total_items
 
-    def _get_page_soup(self, path: str, sf_culture: str) -> BeautifulSoup:
-        ''' Get the raw HTML from a GET request to a URL and turn it into Beautiful Soup.
+    def _parse_page(self, page_content: bytes) -> html.HtmlElement:
+        ''' Parse a page with lxml, so that the items can be selected from it with compiled XPath
+        expressions. A new parser is made for each page, since lxml parsers may not be shared
+        between threads.
+        '''
+        return html.fromstring(page_content, parser=html.HTMLParser(encoding=self.PAGE_ENCODING))
+
+    def _get_page_content(self, path: str, sf_culture: str) -> bytes:
+        ''' Get the raw HTML from a GET request to a URL. The content is not decoded, since the
+        HTML parser can decode the bytes itself faster than decoding them to a str first.
 
         Args:
             url (str): A path to a web page.
             sf_culture (str): The language to get the content in
 
         Returns:
-            (BeautifulSoup): The soup-ified page content
+            (bytes): The undecoded page content
         '''
         response, _ = self._atom.get(path, {}, {'Accept': 'text/html'}, sf_culture)
-        return BeautifulSoup(response.text, 'html.parser')
+        return response.content
+
+
+# Shared by every model for the life of the process, so that threads are only started once. The
+# threads are started as they are needed, and only wait on network requests.
+_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=VirtualBaseModel.MAX_THREAD_POOL_EXECUTORS, thread_name_prefix='atomapi')
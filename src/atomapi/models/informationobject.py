@@ -1,24 +1,19 @@
-import re
-
 from atomapi.models.base import BaseModel
 
 
 QUERY_VALIDATORS = {
     'sq': {
         'verbose_name': 'Query String',
-        'regex': re.compile(r'^sq(?P<index>\d+)$')
     },
     'sf': {
         'verbose_name': 'Field String',
-        'regex': re.compile(r'^sf(?P<index>\d+)$'),
     },
     'so': {
         'verbose_name': 'Operator String',
-        'regex': re.compile(r'^so(?P<index>\d+)$'),
     },
 }
 
-VALID_FILTERS = (
+VALID_FILTERS = frozenset((
     'collection',
     'copyrightStatus',
     'creators',
@@ -40,7 +35,7 @@ VALID_FILTERS = (
     'startDate',
     'subjects',
     'topLod',
-)
+))
 
 
 class InformationObject(BaseModel):
@@ -48,70 +43,80 @@ class InformationObject(BaseModel):
     while reading involves fetching the metadata for a single object.
     '''
 
-    def raise_for_json_error(self, json_response, request_url):
-        if 'message' in json_response:
-            if 'information object not found' in json_response['message'].lower():
-                raise ConnectionError(f'No information object found at "{request_url}"')
-        super().raise_for_json_error(json_response, request_url)
+    JSON_ERRORS = (
+        ('information object not found', 'No information object found at "{url}"'),
+    ) + BaseModel.JSON_ERRORS
 
     @property
     def read_api_url(self):
         return '/api/informationobjects/{identifier}'
 
     def read(self, id_: str, sf_culture: str = 'en'):
+        ''' Read the metadata of one information object. If the Atom has a cache, the returned
+        object is shared with later calls, so copy it before modifying it.
+        '''
         request_path = self.read_api_url.format(identifier=id_)
         return self.get_json(request_path, params=None, sf_culture=sf_culture)
 
+    def read_many(self, ids_: list, sf_culture: str = 'en') -> list:
+        ''' Read several information objects at once. The objects are fetched concurrently rather
+        than one after the other.
+
+        Args:
+            ids_ (list): The identifiers of the objects to read
+            sf_culture (str): The language to read the objects in, defaults to 'en'
+
+        Returns:
+            (list): The metadata for each object, in the same order as the identifiers. If the
+            Atom has a cache, the objects are shared with later calls, so copy them before
+            modifying them
+        '''
+        request_paths = [self.read_api_url.format(identifier=id_) for id_ in ids_]
+        return self.get_json_many(request_paths, sf_culture=sf_culture)
+
     @property
     def browse_api_url(self):
         ''' Use GET parameters to browse objects '''
         return '/api/informationobjects'
 
     def browse(self, sq: dict, sf: dict, so: dict, filters: dict, sf_culture: str = 'en'):
-        self._validate_sq(sq)
-        self._validate_sf(sf)
-        self._validate_so(so)
-        self._validate_filters(filters)
-        params = {
-            **sq,
-            **sf,
-            **so,
-            **filters
-        }
+        ''' Search for information objects. If the Atom has a cache, the returned results are shared
+        with later calls, so copy them before modifying them.
+        '''
+        params = self._validate_and_merge(sq, sf, so, filters)
         return self.get_json(self.browse_api_url, params=params, sf_culture=sf_culture)
 
-    def _validate_sq(self, sq: dict):
-        self._validate_query_parameters(sq, two_letter_code='sq')
-
-    def _validate_sf(self, sf: dict):
-        self._validate_query_parameters(sf, two_letter_code='sf')
-
-    def _validate_so(self, so: dict):
-        self._validate_query_parameters(so, two_letter_code='so')
-        for value in so.values():
-            if value not in ('and', 'or', 'not'):
-                name = QUERY_VALIDATORS['so']['verbose_name']
-                raise ValueError(f'{name} "{value}" was not one of: and, or, not')
+    def _validate_and_merge(self, sq: dict, sf: dict, so: dict, filters: dict) -> dict:
+        ''' Validate the query, field, and operator strings and the filters, and merge them into a
+        single dict of GET parameters in the same pass.
+        '''
+        params = {}
+        self._merge_query_parameters(sq, 'sq', params)
+        self._merge_query_parameters(sf, 'sf', params)
+        self._merge_query_parameters(so, 'so', params)
+        for key, value in filters.items():
+            if key not in VALID_FILTERS:
+                raise ValueError(f'Filter Type "{key}" was not recognized')
+            if not value:
+                raise ValueError('Filter values may not be empty')
+            params[key] = value
+        return params
 
-    def _validate_query_parameters(self, queries: dict, two_letter_code: str):
+    def _merge_query_parameters(self, queries: dict, two_letter_code: str, params: dict):
         indices = set()
-        regex = QUERY_VALIDATORS[two_letter_code]['regex']
         name = QUERY_VALIDATORS[two_letter_code]['verbose_name']
+        is_operator = two_letter_code == 'so'
         for key, value in queries.items():
-            match_obj = regex.match(key)
-            if not match_obj:
+            index = key[2:]
+            if not (key.startswith(two_letter_code) and index.isdecimal()):
                 raise ValueError(f'{name} "{key}" did not start with "{two_letter_code}", followed '
                                  'by one or more numbers')
-            curr_index = int(match_obj.group('index'))
+            curr_index = int(index)
             if curr_index in indices:
                 raise ValueError(f'{name} with index "{curr_index}" was specified more than once')
             indices.add(curr_index)
             if not value:
                 raise ValueError(f'{name}s may not be empty')
-
-    def _validate_filters(self, filters: dict):
-        for key, value in filters.items():
-            if key not in VALID_FILTERS:
-                raise ValueError(f'Filter Type "{key}" was not recognized')
-            if not value:
-                raise ValueError('Filter values may not be empty')
+            if is_operator and value not in ('and', 'or', 'not'):
+                raise ValueError(f'{name} "{value}" was not one of: and, or, not')
+            params[key] = value
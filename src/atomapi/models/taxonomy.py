@@ -1,12 +1,15 @@
 from enum import Enum
-from typing import Union
+from typing import Iterator, Union
 
-from atomapi.models.base import BaseModel, VirtualBaseModel
+from lxml import etree
+
+from atomapi.models.base import BaseModel, VirtualBaseModel, element_text
 from atomapi.utils import partial_format
 
 
 class TaxonomyId(Enum):
-    ''' AtoM's default ID number for each taxonomy type
+    ''' AtoM's default ID number for each taxonomy type. It is possible to change what IDs AtoM uses
+    for these taxonomies, so use these only if you're sure the IDs have not been changed.
 
     See:
     https://www.accesstomemory.org/fr/docs/2.6/dev-manual/api/browse-taxonomies/#api-browse-taxonomies
@@ -29,10 +32,10 @@ class TaxonomyId(Enum):
     @staticmethod
     def from_str(label: str):
         clean_label = label.strip().upper()
-        parsed = getattr(TaxonomyId, clean_label, None)
-        if parsed is None:
-            raise ValueError(f'Could not parse taxonomy ID from "{label}"')
-        return parsed
+        try:
+            return TaxonomyId[clean_label]
+        except KeyError:
+            raise ValueError(f'Could not parse taxonomy ID from "{label}"') from None
 
 
 class Taxonomy(BaseModel):
@@ -47,6 +50,10 @@ class Taxonomy(BaseModel):
     +-------------+--------------------------------+
     '''
 
+    JSON_ERRORS = (
+        ('taxonomy not found', 'No taxonomies found at "{url}"'),
+    ) + BaseModel.JSON_ERRORS
+
     @staticmethod
     def parse_id(id_: Union[str, TaxonomyId, int]):
         if isinstance(id_, str):
@@ -61,12 +68,6 @@ class Taxonomy(BaseModel):
     def api_url(self):
         return '/api/taxonomies/{identifier}'
 
-    def raise_for_json_error(self, json_response, request_url):
-        if 'message' in json_response:
-            if 'taxonomy not found' in json_response['message'].lower():
-                raise ConnectionError(f'No taxonomies found at "{request_url}"')
-        super().raise_for_json_error(json_response, request_url)
-
     def browse(self, id_: Union[str, TaxonomyId, int], sf_culture: str = 'en') -> list:
         ''' Get a complete list of taxonomies of one type from AtoM.
 
@@ -81,12 +82,30 @@ class Taxonomy(BaseModel):
             sf_culture (str): The language to fetch taxonomies in, default to 'en'
 
         Returns:
-            (list): A list of taxonomy terms. Each term is a dictionary with a "name" key
+            (list): A list of taxonomy terms. Each term is a dictionary with a "name" key.
+            If the Atom has a cache, the list is shared with later calls, so copy it before
+            modifying it
         '''
         object_id = Taxonomy.parse_id(id_)
         request_path = self.api_url.format(identifier=object_id)
         return self.get_json(request_path, None, sf_culture)
 
+    def browse_many(self, ids_: list, sf_culture: str = 'en') -> list:
+        ''' Get the complete lists of terms for several taxonomies at once. The taxonomies are
+        fetched concurrently rather than one after the other.
+
+        Args:
+            ids_ (list): The taxonomy selectors, each one as accepted by browse()
+            sf_culture (str): The language to fetch taxonomies in, default to 'en'
+
+        Returns:
+            (list): The list of terms for each taxonomy, in the same order as the selectors. If the
+            Atom has a cache, the lists are shared with later calls, so copy them before modifying
+            them
+        '''
+        request_paths = [self.api_url.format(identifier=Taxonomy.parse_id(id_)) for id_ in ids_]
+        return self.get_json_many(request_paths, sf_culture=sf_culture)
+
 
 class VirtualTaxonomy(VirtualBaseModel):
     ''' Browse a list of taxonomy terms scraped from the AtoM frontend. Terms can be viewed with the
@@ -101,6 +120,9 @@ class VirtualTaxonomy(VirtualBaseModel):
     +-------------+--------------------------------+
     '''
 
+    # The first link in each table cell
+    TERM_XPATH = etree.XPath('//td/descendant::a[1]')
+
     @property
     def raw_page_path(self):
         return '/taxonomy/index/id/{identifier}?page={page}&limit={limit}'
@@ -119,15 +141,29 @@ class VirtualTaxonomy(VirtualBaseModel):
             sf_culture (str): The language to fetch taxonomies in, default to 'en'
 
         Returns:
-            (list): A list of taxonomy terms. Each term is a dictionary with a "name" key
+            (list): A list of taxonomy terms. Each term is a dictionary with a "name" key.
+            If the Atom has a cache, the list is shared with later calls, so copy it before
+            modifying it
         '''
-        object_id = Taxonomy.parse_id(id_)
-        page_path = partial_format(self.raw_page_path, identifier=object_id)
-        return self.get_list_from_ui(page_path, sieve_soup=self._extract_taxonomies,
+        return self.get_list_from_ui(self._page_path(id_), sieve_page=self._extract_taxonomies,
                                      sf_culture=sf_culture)
 
-    def _extract_taxonomies(self, html_soup):
-        for element in html_soup.find_all('td'):
-            anchor_tag = element.find('a')
-            if anchor_tag:
-                yield {'name': anchor_tag.string}
+    def iter_browse(self, id_: Union[str, TaxonomyId, int], sf_culture: str = 'en') -> Iterator:
+        ''' Iterate over the taxonomies of one type from the AtoM front end as the pages of the
+        list are fetched, without holding the whole list in memory. Results are not cached.
+
+        Takes the same arguments as browse().
+
+        Returns:
+            (Iterator): An iterator over taxonomy terms. Each term is a dictionary with a "name" key
+        '''
+        return self.iter_list_from_ui(self._page_path(id_), sieve_page=self._extract_taxonomies,
+                                      sf_culture=sf_culture)
+
+    def _page_path(self, id_: Union[str, TaxonomyId, int]) -> str:
+        object_id = Taxonomy.parse_id(id_)
+        return partial_format(self.raw_page_path, identifier=object_id)
+
+    def _extract_taxonomies(self, page):
+        for anchor in self.TERM_XPATH(page):
+            yield {'name': element_text(anchor)}
@@ -0,0 +1,106 @@
+from pathlib import Path
+import sys
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+# pylint: disable=wrong-import-position,no-name-in-module,import-error
+from atomapi.atom import Atom
+from atomapi.authorizer import Authorizer
+from atomapi.models.base import VirtualBaseModel
+
+
+URL = 'https://atom.example.com'
+
+
+class SessionAuthorizer(Authorizer):
+    ''' Hands out a session prepared by the test '''
+    def __init__(self, url, session):
+        super().__init__(url)
+        self.session = session
+
+    def authorize(self):
+        return self.session
+
+
+class TestMountAdapters:
+    def test_default_adapters_are_replaced(self):
+        atom = Atom(URL, authorizer=SessionAuthorizer(URL, requests.Session()))
+        for prefix in ('https://', 'http://'):
+            adapter = atom.session.adapters[prefix]
+            assert adapter._pool_maxsize == VirtualBaseModel.MAX_THREAD_POOL_EXECUTORS
+            assert adapter.max_retries.total == 3
+
+    def test_authorizer_adapter_is_kept(self):
+        session = requests.Session()
+        custom_adapter = HTTPAdapter(max_retries=5)
+        session.mount('https://', custom_adapter)
+        atom = Atom(URL, authorizer=SessionAuthorizer(URL, session))
+        assert atom.session.adapters['https://'] is custom_adapter
+        assert atom.session.adapters['http://'] is not custom_adapter
+        assert atom.session.adapters['http://'].max_retries.total == 3
+
+
+def text_response(status_code, text=''):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = text.encode('utf-8')
+    response.encoding = 'utf-8'
+    return response
+
+
+class RobotsSession(requests.Session):
+    ''' Serves a robots.txt response set by the test, and an empty page for every other URL '''
+    def __init__(self, robots_response):
+        super().__init__()
+        self.robots_response = robots_response
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        if url.endswith('/robots.txt'):
+            return self.robots_response
+        return text_response(200, '<html></html>')
+
+
+def atom_with_robots(robots_response):
+    session = RobotsSession(robots_response)
+    return Atom(URL, authorizer=SessionAuthorizer(URL, session)), session
+
+
+class TestReadRobots:
+    @pytest.mark.parametrize('status_code', [401, 403])
+    def test_denied_robots_disallows_all(self, status_code):
+        atom, session = atom_with_robots(text_response(status_code))
+        with pytest.raises(ConnectionError):
+            atom.get('/actor/browse')
+        assert atom.robots.disallow_all
+        assert session.urls == [f'{URL}/robots.txt']
+
+    @pytest.mark.parametrize('status_code', [400, 404, 410])
+    def test_missing_robots_allows_all(self, status_code):
+        atom, session = atom_with_robots(text_response(status_code))
+        atom.get('/actor/browse')
+        assert atom.robots.allow_all
+        assert session.urls == [f'{URL}/robots.txt', f'{URL}/actor/browse']
+
+    def test_robots_is_parsed(self):
+        atom, session = atom_with_robots(
+            text_response(200, 'User-agent: *\nDisallow: /private/\n'))
+        atom.get('/actor/browse')
+        with pytest.raises(ConnectionError):
+            atom.get('/private/page')
+        assert session.urls == [f'{URL}/robots.txt', f'{URL}/actor/browse']
+
+    @pytest.mark.parametrize('status_code', [500, 503])
+    def test_server_error_fetches_nothing_and_retries_robots(self, status_code):
+        atom, session = atom_with_robots(text_response(status_code))
+        with pytest.raises(ConnectionError):
+            atom.get('/actor/browse')
+        assert atom.robots.last_checked == 0
+        session.robots_response = text_response(404)
+        atom.get('/actor/browse')
+        assert session.urls == [f'{URL}/robots.txt', f'{URL}/robots.txt', f'{URL}/actor/browse']
@@ -0,0 +1,60 @@
+from pathlib import Path
+import sys
+
+from lxml import html
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+# pylint: disable=wrong-import-position,no-name-in-module,import-error
+from atomapi.models.authority import VirtualAuthority
+
+
+def extract(body):
+    page = html.fromstring(f'<html><body>{body}</body></html>')
+    return list(VirtualAuthority(None)._extract_authorities(page))
+
+
+class TestExtractAuthorities:
+    def test_extracts_name_and_reference_code(self):
+        authorities = extract(
+            '<article class="search-result">'
+            '<p class="title"><a href="/a">Smith, John</a></p>'
+            '<ul><li class="reference-code">REF-1</li></ul>'
+            '</article>'
+        )
+        assert authorities == [{'name': 'Smith, John', 'reference_code': 'REF-1'}]
+
+    def test_article_with_several_classes(self):
+        authorities = extract(
+            '<article class="search-result has-preview">'
+            '<p class="title lead"><a href="/a">Smith, John</a></p>'
+            '</article>'
+        )
+        assert authorities == [{'name': 'Smith, John', 'reference_code': ''}]
+
+    def test_missing_reference_code_is_empty(self):
+        authorities = extract(
+            '<article class="search-result"><p class="title"><a href="/a">Smith</a></p></article>'
+        )
+        assert authorities[0]['reference_code'] == ''
+
+    def test_name_in_child_elements(self):
+        authorities = extract(
+            '<article class="search-result">'
+            '<p class="title"><a href="/a"><span>Smith, John</span></a></p>'
+            '</article>'
+        )
+        assert authorities[0]['name'] == 'Smith, John'
+
+    def test_article_without_title_is_skipped(self):
+        authorities = extract(
+            '<article class="search-result"><p>No title</p></article>'
+            '<article class="search-result"><p class="title"><a href="/a">Smith</a></p></article>'
+        )
+        assert authorities == [{'name': 'Smith', 'reference_code': ''}]
+
+    def test_other_articles_are_ignored(self):
+        authorities = extract(
+            '<article class="search-results-header"><p class="title"><a>Header</a></p></article>'
+        )
+        assert authorities == []
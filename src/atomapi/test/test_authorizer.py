@@ -0,0 +1,143 @@
+from pathlib import Path
+import json
+import os
+import sys
+import time
+
+import pytest
+import requests
+from requests.cookies import create_cookie
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+# pylint: disable=wrong-import-position,no-name-in-module,import-error
+from atomapi import authorizer as authorizer_module
+from atomapi.authorizer import F5Authorizer
+
+
+URL = 'https://atom.example.com'
+
+
+def f5_cookie(name='MRHSession', value='abc', domain='atom.example.com', **kwargs):
+    return create_cookie(name=name, value=value, domain=domain, path='/', secure=True, **kwargs)
+
+
+def head_response(status_code, location=None):
+    response = requests.Response()
+    response.status_code = status_code
+    if location:
+        response.headers['Location'] = location
+    return response
+
+
+@pytest.fixture
+def cookie_file(tmp_path):
+    return tmp_path / 'cookies.json'
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    ''' Replace the authorizer's Session with one whose HEAD response is set by the test '''
+    class FakeSession(requests.Session):
+        response = head_response(200)
+        head_calls = 0
+
+        def head(self, url, **kwargs):
+            FakeSession.head_calls += 1
+            return FakeSession.response
+
+    monkeypatch.setattr(authorizer_module, 'Session', FakeSession)
+    return FakeSession
+
+
+@pytest.fixture
+def log_ins(monkeypatch):
+    ''' Record log ins rather than prompting for credentials, and give the session a new cookie '''
+    calls = []
+    def log_in(self, session):
+        calls.append(session)
+        session.cookies.set_cookie(f5_cookie(value='new'))
+    monkeypatch.setattr(F5Authorizer, '_log_in', log_in)
+    return calls
+
+
+class TestCookieFile:
+    def test_round_trip_keeps_cookie_attributes(self, cookie_file):
+        authorizer = F5Authorizer(URL, cookie_file=cookie_file)
+        expires = int(time.time()) + 3600
+        session = requests.Session()
+        session.cookies.set_cookie(f5_cookie(expires=expires))
+        authorizer._save_cookies(session)
+
+        loaded_session = requests.Session()
+        assert authorizer._load_cookies(loaded_session)
+        cookie, = list(loaded_session.cookies)
+        assert (cookie.name, cookie.value) == ('MRHSession', 'abc')
+        assert cookie.domain == 'atom.example.com'
+        assert cookie.path == '/'
+        assert cookie.secure
+        assert cookie.expires == expires
+
+    @pytest.mark.skipif(not hasattr(os, 'fchmod'), reason='file modes are only set on POSIX')
+    def test_file_is_private(self, cookie_file):
+        authorizer = F5Authorizer(URL, cookie_file=cookie_file)
+        authorizer._save_cookies(requests.Session())
+        assert cookie_file.stat().st_mode & 0o777 == 0o600
+
+    def test_cookies_for_other_hosts_are_not_loaded(self, cookie_file):
+        session = requests.Session()
+        session.cookies.set_cookie(f5_cookie(domain='other.example.org'))
+        F5Authorizer('https://other.example.org', cookie_file=cookie_file)._save_cookies(session)
+        assert not F5Authorizer(URL, cookie_file=cookie_file)._load_cookies(requests.Session())
+
+    def test_parent_domain_cookies_are_loaded(self, cookie_file):
+        session = requests.Session()
+        session.cookies.set_cookie(f5_cookie(domain='.example.com'))
+        authorizer = F5Authorizer(URL, cookie_file=cookie_file)
+        authorizer._save_cookies(session)
+        assert authorizer._load_cookies(requests.Session())
+
+    def test_expired_cookies_are_not_loaded(self, cookie_file):
+        session = requests.Session()
+        session.cookies.set_cookie(f5_cookie(expires=int(time.time()) - 60))
+        authorizer = F5Authorizer(URL, cookie_file=cookie_file)
+        authorizer._save_cookies(session)
+        assert not authorizer._load_cookies(requests.Session())
+
+    @pytest.mark.parametrize('contents', ['not json', '{"MRHSession": "abc"}', '[{"nope": 1}]'])
+    def test_unreadable_file_is_ignored(self, cookie_file, contents):
+        cookie_file.write_text(contents)
+        assert not F5Authorizer(URL, cookie_file=cookie_file)._load_cookies(requests.Session())
+
+
+class TestAuthorize:
+    def save_cookie(self, cookie_file):
+        session = requests.Session()
+        session.cookies.set_cookie(f5_cookie())
+        F5Authorizer(URL, cookie_file=cookie_file)._save_cookies(session)
+
+    def test_reuses_accepted_cookies(self, cookie_file, fake_session, log_ins):
+        self.save_cookie(cookie_file)
+        session = F5Authorizer(URL, cookie_file=cookie_file).authorize()
+        assert not log_ins
+        assert fake_session.head_calls == 1
+        assert session.cookies.get('MRHSession') == 'abc'
+
+    @pytest.mark.parametrize('response', [
+        head_response(401),
+        head_response(403),
+        head_response(302, location='/my.policy'),
+    ])
+    def test_logs_in_when_cookies_are_refused(self, cookie_file, fake_session, log_ins, response):
+        self.save_cookie(cookie_file)
+        fake_session.response = response
+        session = F5Authorizer(URL, cookie_file=cookie_file).authorize()
+        assert len(log_ins) == 1
+        assert session.cookies.get('MRHSession') == 'new'
+        saved, = json.loads(cookie_file.read_text())
+        assert saved['value'] == 'new'
+
+    def test_logs_in_without_saved_cookies(self, cookie_file, fake_session, log_ins):
+        F5Authorizer(URL, cookie_file=cookie_file).authorize()
+        assert len(log_ins) == 1
+        assert fake_session.head_calls == 0
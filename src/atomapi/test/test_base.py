@@ -0,0 +1,263 @@
+from pathlib import Path
+from types import SimpleNamespace
+import json
+import sys
+
+import pytest
+import requests
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+# pylint: disable=wrong-import-position,no-name-in-module,import-error
+from atomapi import cache as cache_module
+from atomapi.atom import Atom
+from atomapi.authorizer import Authorizer
+from atomapi.models.base import BaseModel, VirtualBaseModel
+
+
+URL = 'https://atom.example.com'
+
+
+class SessionAuthorizer(Authorizer):
+    ''' Hands out a session prepared by the test '''
+    def __init__(self, url, session):
+        super().__init__(url)
+        self.session = session
+
+    def authorize(self):
+        return self.session
+
+
+class ApiSession(requests.Session):
+    ''' Answers each GET request with the next response queued by the test, and records the
+    requests made
+    '''
+    def __init__(self):
+        super().__init__()
+        self.responses = []
+        self.requests = []
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        self.requests.append({'url': url, 'headers': dict(headers or {})})
+        return self.responses.pop(0)
+
+
+def api_response(status_code=200, body=None, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = URL
+    response.headers.update(headers or {})
+    response._content = json.dumps(body).encode('utf-8') if body is not None else b''
+    return response
+
+
+class ApiModel(BaseModel):
+    pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    current_time = [1000.0]
+    monkeypatch.setattr(cache_module, 'time', SimpleNamespace(monotonic=lambda: current_time[0]))
+    return current_time
+
+
+@pytest.fixture
+def session():
+    return ApiSession()
+
+
+@pytest.fixture
+def atom(session):
+    return Atom(URL, api_key='key', authorizer=SessionAuthorizer(URL, session), cache_seconds=60)
+
+
+class TestHashableParams:
+    def test_no_params(self):
+        assert BaseModel._hashable_params(None) == ()
+        assert BaseModel._hashable_params({}) == ()
+
+    def test_list_values_are_hashable(self):
+        key = BaseModel._hashable_params({'subjects': [1, 2], 'sq0': 'School'})
+        assert hash(key)
+        assert key == (('sq0', 'School'), ('subjects', (1, 2)))
+
+    def test_order_does_not_matter(self):
+        first = BaseModel._hashable_params({'sq0': 'School', 'sf0': 'title'})
+        second = BaseModel._hashable_params({'sf0': 'title', 'sq0': 'School'})
+        assert first == second
+
+
+class ListModel(VirtualBaseModel):
+    pass
+
+
+def page(result_count):
+    return ('<html><head><meta charset="utf-8"></head><body><table></table>'
+            f'{result_count}</body></html>').encode('utf-8')
+
+
+class TestTotalListItems:
+    @pytest.mark.parametrize('result_count,total', [
+        ('<div class="result-count">Results 1 to 10 of 35</div>', 35),
+        ('<div class="result-count">\n  Results 0 to 0 of 0\n</div>', 0),
+        ('<div class="result-count">Résultats 1 à 10 sur 11</div>', 11),
+        ('<div class="result-count">Resultaten 1 tot 10 van 10</div>', 10),
+        ('<section><div class="text-center result-count">Resultados 1 a 10 de 57</div></section>',
+         57),
+    ])
+    def test_result_count_in_raw_html(self, result_count, total):
+        assert ListModel(None)._get_total_list_items(page(result_count)) == total
+
+    @pytest.mark.parametrize('result_count,total', [
+        ('<div class="result-count">Results <b>1</b> to <b>10</b> of <b>35</b></div>', 35),
+        ('<div class="result-count">R&eacute;sultats 1 &agrave; 10 sur 11</div>', 11),
+        ('<div class="result-count">Results&nbsp;1 to 10 of 10</div>', 10),
+    ])
+    def test_result_count_needing_parse(self, result_count, total):
+        assert ListModel(None)._get_total_list_items(page(result_count)) == total
+
+    def test_text_before_result_count_is_ignored(self):
+        content = page('<p>Results 1 to 10 of 99</p>'
+                       '<div class="result-count">Results 1 to 10 of 35</div>')
+        assert ListModel(None)._get_total_list_items(content) == 35
+
+    def test_missing_result_count(self):
+        with pytest.raises(ConnectionError):
+            ListModel(None)._get_total_list_items(page('<p>Results 1 to 10 of 35</p>'))
+
+    def test_unreadable_result_count(self):
+        with pytest.raises(ConnectionError):
+            ListModel(None)._get_total_list_items(page('<div class="result-count">None</div>'))
+
+
+class TestEnumerateListUrls:
+    @pytest.mark.parametrize('total,pages', [
+        (0, []),
+        (1, []),
+        (10, []),
+        (11, [2]),
+        (20, [2]),
+        (35, [2, 3, 4]),
+    ])
+    def test_pages_after_the_first(self, total, pages):
+        urls = ListModel(None)._enumerate_list_urls('/list?page={page}&limit=10', total)
+        assert urls == [f'/list?page={p}&limit=10' for p in pages]
+
+
+class TestGetJsonRevalidation:
+    def test_fresh_response_is_not_requested_again(self, atom, session, clock):
+        session.responses.append(api_response(body=[{'name': 'Place'}], headers={'ETag': '"1"'}))
+        model = ApiModel(atom)
+        first = model.get_json('/api/taxonomies/42')
+        clock[0] += 59
+        assert model.get_json('/api/taxonomies/42') is first
+        assert len(session.requests) == 1
+
+    def test_expired_response_with_etag_sends_if_none_match(self, atom, session, clock):
+        session.responses.append(api_response(
+            body=[{'name': 'Place'}],
+            headers={'ETag': '"1"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}))
+        session.responses.append(api_response(304))
+        model = ApiModel(atom)
+        model.get_json('/api/taxonomies/42')
+        clock[0] += 60
+        model.get_json('/api/taxonomies/42')
+        assert 'If-None-Match' not in session.requests[0]['headers']
+        assert session.requests[1]['headers']['If-None-Match'] == '"1"'
+        assert session.requests[1]['headers']['If-Modified-Since'] == \
+            'Wed, 21 Oct 2015 07:28:00 GMT'
+
+    def test_not_modified_returns_and_stores_old_response(self, atom, session, clock):
+        session.responses.append(api_response(body=[{'name': 'Place'}], headers={'ETag': '"1"'}))
+        session.responses.append(api_response(304))
+        model = ApiModel(atom)
+        first = model.get_json('/api/taxonomies/42')
+        clock[0] += 60
+        assert model.get_json('/api/taxonomies/42') is first
+        # The old response is fresh again, so it is not revalidated until it expires again
+        clock[0] += 59
+        assert model.get_json('/api/taxonomies/42') is first
+        assert len(session.requests) == 2
+
+    def test_modified_response_replaces_old_response(self, atom, session, clock):
+        session.responses.append(api_response(body=[{'name': 'Place'}], headers={'ETag': '"1"'}))
+        session.responses.append(api_response(body=[{'name': 'Town'}], headers={'ETag': '"2"'}))
+        session.responses.append(api_response(304))
+        model = ApiModel(atom)
+        model.get_json('/api/taxonomies/42')
+        clock[0] += 60
+        assert model.get_json('/api/taxonomies/42') == [{'name': 'Town'}]
+        clock[0] += 59
+        assert model.get_json('/api/taxonomies/42') == [{'name': 'Town'}]
+        assert len(session.requests) == 2
+        clock[0] += 1
+        model.get_json('/api/taxonomies/42')
+        assert session.requests[2]['headers']['If-None-Match'] == '"2"'
+
+    def test_expired_response_without_validators_is_requested_in_full(self, atom, session, clock):
+        session.responses.append(api_response(body=[{'name': 'Place'}]))
+        session.responses.append(api_response(body=[{'name': 'Town'}]))
+        model = ApiModel(atom)
+        model.get_json('/api/taxonomies/42')
+        clock[0] += 60
+        assert model.get_json('/api/taxonomies/42') == [{'name': 'Town'}]
+        assert 'If-None-Match' not in session.requests[1]['headers']
+
+
+class TestGetJsonErrors:
+    def test_http_error_is_cached(self, atom, session, clock):
+        session.responses.append(api_response(404, body={'message': 'Endpoint not found'}))
+        model = ApiModel(atom)
+        with pytest.raises(requests.HTTPError):
+            model.get_json('/api/informationobjects/abc')
+        clock[0] += 59
+        with pytest.raises(requests.HTTPError) as error:
+            model.get_json('/api/informationobjects/abc')
+        assert len(session.requests) == 1
+        assert error.value.response.status_code == 404
+        assert error.value.response.content == b''
+
+    def test_json_error_is_cached(self, atom, session, clock):
+        session.responses.append(api_response(body={'message': 'Endpoint not found'}))
+        model = ApiModel(atom)
+        with pytest.raises(ConnectionError, match='does not exist'):
+            model.get_json('/api/informationobjects/abc')
+        with pytest.raises(ConnectionError, match='does not exist'):
+            model.get_json('/api/informationobjects/abc')
+        assert len(session.requests) == 1
+
+    def test_cached_error_is_raised_as_copy(self, atom, session, clock):
+        session.responses.append(api_response(body={'message': 'Endpoint not found'}))
+        model = ApiModel(atom)
+        errors = []
+        for _ in range(3):
+            with pytest.raises(ConnectionError) as error:
+                model.get_json('/api/informationobjects/abc')
+            errors.append(error.value)
+        assert errors[1] is not errors[2]
+
+    def test_error_expires(self, atom, session, clock):
+        session.responses.append(api_response(body={'message': 'Endpoint not found'}))
+        session.responses.append(api_response(body={'title': 'Found'}))
+        model = ApiModel(atom)
+        with pytest.raises(ConnectionError):
+            model.get_json('/api/informationobjects/abc')
+        clock[0] += 60
+        assert model.get_json('/api/informationobjects/abc') == {'title': 'Found'}
+        assert len(session.requests) == 2
+
+    @pytest.mark.parametrize('change_credentials', [
+        lambda atom, session: atom.set_api_key('new key'),
+        lambda atom, session: atom.set_authorizer(SessionAuthorizer(URL, session)),
+        lambda atom, session: atom.reset_connection(),
+    ])
+    def test_changing_credentials_clears_errors(self, atom, session, clock, change_credentials):
+        session.responses.append(api_response(body={'message': 'Not authorized'}))
+        session.responses.append(api_response(body={'title': 'Found'}))
+        model = ApiModel(atom)
+        with pytest.raises(ConnectionError, match='not authorized'):
+            model.get_json('/api/informationobjects/abc')
+        change_credentials(atom, session)
+        assert model.get_json('/api/informationobjects/abc') == {'title': 'Found'}
+        assert len(session.requests) == 2
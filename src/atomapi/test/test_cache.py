@@ -0,0 +1,104 @@
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+# pylint: disable=wrong-import-position,no-name-in-module,import-error
+import cache as cache_module
+from cache import Cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    current_time = [1000.0]
+    # Replace the module's time with a stub, rather than patching time.monotonic for everyone
+    monkeypatch.setattr(cache_module, 'time', SimpleNamespace(monotonic=lambda: current_time[0]))
+    return current_time
+
+
+class TestCache:
+    def test_disabled_cache_stores_nothing(self):
+        cache = Cache(0)
+        cache.store('key', {'name': 'value'})
+        assert not cache.enabled
+        assert cache.retrieve('key') is None
+
+    def test_retrieves_stored_object(self):
+        cache = Cache(60)
+        obj = [{'name': 'Place'}]
+        cache.store('key', obj)
+        assert cache.retrieve('key') is obj
+
+    def test_missing_key_returns_none(self):
+        cache = Cache(60)
+        assert cache.retrieve('key') is None
+
+    def test_object_expires(self, clock):
+        cache = Cache(60)
+        cache.store('key', 'value')
+        clock[0] += 59
+        assert cache.retrieve('key') == 'value'
+        clock[0] += 1
+        assert cache.retrieve('key') is None
+
+    def test_least_recently_used_object_is_evicted(self):
+        cache = Cache(60, maxsize=2)
+        cache.store('first', 1)
+        cache.store('second', 2)
+        cache.retrieve('first')
+        cache.store('third', 3)
+        assert cache.retrieve('first') == 1
+        assert cache.retrieve('second') is None
+        assert cache.retrieve('third') == 3
+
+    def test_clear(self):
+        cache = Cache(60)
+        cache.store('key', 'value')
+        cache.clear()
+        assert cache.retrieve('key') is None
+
+    def test_expired_object_without_validators_is_not_stale(self, clock):
+        cache = Cache(60)
+        cache.store('key', 'value')
+        clock[0] += 60
+        assert cache.retrieve('key') is None
+        assert cache.retrieve_stale('key') == (None, {})
+
+    def test_expired_object_with_validators_is_stale(self, clock):
+        cache = Cache(60)
+        cache.store('key', 'value', etag='"abc"', last_modified='Wed, 21 Oct 2015 07:28:00 GMT')
+        clock[0] += 60
+        assert cache.retrieve('key') is None
+        obj, headers = cache.retrieve_stale('key')
+        assert obj == 'value'
+        assert headers == {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT',
+        }
+
+    def test_retrieves_stored_error(self):
+        cache = Cache(600)
+        error = ConnectionError('not found')
+        cache.store_error('key', error)
+        assert cache.retrieve_error('key') is error
+        assert cache.retrieve('key') is None
+
+    def test_error_expires_before_objects(self, clock):
+        cache = Cache(600, error_seconds=30)
+        cache.store_error('key', ConnectionError('not found'))
+        clock[0] += 30
+        assert cache.retrieve_error('key') is None
+
+    def test_error_expires_with_short_lived_cache(self, clock):
+        cache = Cache(10, error_seconds=30)
+        cache.store_error('key', ConnectionError('not found'))
+        clock[0] += 10
+        assert cache.retrieve_error('key') is None
+
+    def test_disabled_cache_stores_no_errors(self):
+        cache = Cache(0)
+        cache.store_error('key', ConnectionError('not found'))
+        assert cache.retrieve_error('key') is None
@@ -0,0 +1,66 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+# pylint: disable=wrong-import-position,no-name-in-module,import-error
+from atomapi.models.informationobject import InformationObject
+
+
+def merge(sq=None, sf=None, so=None, filters=None):
+    return InformationObject(None)._validate_and_merge(sq or {}, sf or {}, so or {}, filters or {})
+
+
+class TestValidateAndMerge:
+    def test_merges_all_parameters(self):
+        params = merge(
+            sq={'sq0': 'School', 'sq1': 'Residential'},
+            sf={'sf0': 'title', 'sf1': 'scopeAndContent'},
+            so={'so1': 'and'},
+            filters={'places': [1, 2], 'onlyMedia': 1},
+        )
+        assert params == {
+            'sq0': 'School', 'sq1': 'Residential',
+            'sf0': 'title', 'sf1': 'scopeAndContent',
+            'so1': 'and',
+            'places': [1, 2], 'onlyMedia': 1,
+        }
+
+    def test_no_parameters(self):
+        assert merge() == {}
+
+    @pytest.mark.parametrize('queries', [
+        {'sq': 'School'},
+        {'sqa': 'School'},
+        {'sf0': 'School'},
+        {'query0': 'School'},
+    ])
+    def test_bad_query_key(self, queries):
+        with pytest.raises(ValueError):
+            merge(sq=queries)
+
+    def test_index_specified_twice(self):
+        with pytest.raises(ValueError):
+            merge(sq={'sq1': 'School', 'sq01': 'Residential'})
+
+    def test_empty_query(self):
+        with pytest.raises(ValueError):
+            merge(sq={'sq0': ''})
+
+    @pytest.mark.parametrize('operator', ['and', 'or', 'not'])
+    def test_valid_operator(self, operator):
+        assert merge(so={'so0': operator}) == {'so0': operator}
+
+    def test_invalid_operator(self):
+        with pytest.raises(ValueError):
+            merge(so={'so0': 'xor'})
+
+    def test_unknown_filter(self):
+        with pytest.raises(ValueError):
+            merge(filters={'colour': 'red'})
+
+    def test_empty_filter(self):
+        with pytest.raises(ValueError):
+            merge(filters={'places': []})
@@ -0,0 +1,110 @@
+from pathlib import Path
+import json
+import sys
+
+from lxml import html
+import pytest
+import requests
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+# pylint: disable=wrong-import-position,no-name-in-module,import-error
+from atomapi.atom import Atom
+from atomapi.authorizer import Authorizer
+from atomapi.models.taxonomy import Taxonomy, TaxonomyId, VirtualTaxonomy
+
+
+def extract(body):
+    page = html.fromstring(f'<html><body><table>{body}</table></body></html>')
+    return list(VirtualTaxonomy(None)._extract_taxonomies(page))
+
+
+class TestExtractTaxonomies:
+    def test_extracts_link_text(self):
+        terms = extract('<tr><td><a href="/a">Toronto</a></td></tr>'
+                        '<tr><td><a href="/b">Montréal</a></td></tr>')
+        assert terms == [{'name': 'Toronto'}, {'name': 'Montréal'}]
+
+    def test_text_in_child_elements(self):
+        terms = extract('<tr><td><a href="/a"><span>Toronto</span></a></td></tr>')
+        assert terms == [{'name': 'Toronto'}]
+
+    def test_only_first_link_in_cell(self):
+        terms = extract('<tr><td><a href="/a">Toronto</a> <a href="/b">Edit</a></td></tr>')
+        assert terms == [{'name': 'Toronto'}]
+
+    def test_cells_without_links_are_skipped(self):
+        terms = extract('<tr><td>12</td><td><a href="/a">Toronto</a></td></tr>')
+        assert terms == [{'name': 'Toronto'}]
+
+
+class UrlSession(requests.Session):
+    ''' Answers each GET request with the response for its URL, since concurrent requests may be
+    made in any order, and records the URLs requested
+    '''
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = responses
+        self.requested = []
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        self.requested.append(url)
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = json.dumps(self.responses[url]).encode('utf-8')
+        return response
+
+
+class SessionAuthorizer(Authorizer):
+    ''' Hands out a session prepared by the test '''
+    def __init__(self, url, session):
+        super().__init__(url)
+        self.session = session
+
+    def authorize(self):
+        return self.session
+
+
+URL = 'https://atom.example.com'
+
+TERMS = {
+    f'{URL}/api/taxonomies/42': [{'name': 'Toronto'}],
+    f'{URL}/api/taxonomies/35': [{'name': 'Schools'}],
+    f'{URL}/api/taxonomies/78': [{'name': 'Letters'}],
+    f'{URL}/api/taxonomies/1': {'message': 'Taxonomy not found'},
+}
+
+
+@pytest.fixture
+def session():
+    return UrlSession(TERMS)
+
+
+@pytest.fixture
+def atom(session):
+    return Atom(URL, api_key='key', authorizer=SessionAuthorizer(URL, session), cache_seconds=60)
+
+
+class TestBrowseMany:
+    def test_results_in_order_of_ids(self, atom):
+        terms = Taxonomy(atom).browse_many(['places', TaxonomyId.SUBJECTS, 78, 42])
+        assert terms == [
+            [{'name': 'Toronto'}],
+            [{'name': 'Schools'}],
+            [{'name': 'Letters'}],
+            [{'name': 'Toronto'}],
+        ]
+
+    def test_cached_taxonomies_are_not_requested(self, atom, session):
+        taxonomy = Taxonomy(atom)
+        taxonomy.browse('places')
+        taxonomy.browse_many(['places', 'subjects'])
+        assert sorted(session.requested) == [
+            f'{URL}/api/taxonomies/35',
+            f'{URL}/api/taxonomies/42',
+        ]
+
+    def test_error_for_one_id_is_raised(self, atom):
+        with pytest.raises(ConnectionError, match='No taxonomies found'):
+            Taxonomy(atom).browse_many(['places', 1, 'subjects'])
@@ -1,7 +1,10 @@
+from functools import lru_cache
 import re
 
 from urllib3.util.url import parse_url
 
+# The parsed Url is an immutable named tuple, so the same object can be shared by every caller
+@lru_cache(maxsize=128)
 def parse_url_from_string(url):
     parsed_url = None
     if not url: